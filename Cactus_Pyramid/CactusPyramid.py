@@ -3,12 +3,32 @@ import random
 import math
 import sys
 import os
+import bisect
+import argparse
+import tracemalloc
+import weakref
+import gc
+from collections import deque, Counter
 
 # --- Configuration ---
 LOGICAL_WIDTH = 800
 LOGICAL_HEIGHT = 600
 FPS = 60
 
+# Input latency
+LOW_LATENCY_INPUT = False # Poll input just before the frame deadline instead of right after the last flip
+LATENCY_MARGIN_MS = 2 # Slack kept between the estimated update + draw cost and the frame deadline
+LATENCY_SPIN_MS = 2 # Final stretch of a low-latency sleep that busy-waits for accuracy
+LATENCY_BUCKETS_MS = (1, 2, 4, 8, 16, 33, 50, 100)
+
+# Memory monitoring
+MEMORY_MONITOR = False
+SOAK_WARMUP_CYCLES = 5 # Cycles ignored while caches fill up
+SOAK_MAX_GROWTH_PER_CYCLE = 16 * 1024 # Traced bytes a warmed-up cycle may add before the soak fails
+SOAK_MAX_RSS_GROWTH_PER_CYCLE = 64 * 1024 # RSS is noisier, allocator pages come and go
+SOAK_MAX_SURFACE_GROWTH_PER_CYCLE = 0 # Every fight surface should be freed by the title screen
+SOAK_MAX_SPRITE_GROWTH_PER_CYCLE = 0 # Likewise every projectile and particle
+
 # Colors
 BLACK = (10, 10, 10)
 WHITE = (255, 255, 255)
@@ -53,7 +73,7 @@ def load_assets():
                 if size:
                     img = pygame.transform.scale(img, size)
                 print(f"[FOUND] Loaded custom art: {name}")
-                return img
+                return track_surface(img)
             except pygame.error as e:
                 print(f"[ERROR] Found {name} but could not load it: {e}")
                 return None
@@ -87,13 +107,33 @@ def wrap_text(text, font, max_width):
     lines.append(' '.join(current_line))
     return lines
 
+def format_bytes(n, signed=False):
+    sign = ('+' if n >= 0 else '-') if signed else ''
+    n = abs(n)
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{sign}{n:.1f} {unit}" if unit != 'B' else f"{sign}{n:.0f} {unit}"
+        n /= 1024
+    return f"{sign}{n:.1f} GB"
+
+def format_count(n, signed=False):
+    return f"{n:+.2f}" if signed else f"{n}"
+
+# Set by MemoryMonitor so the places that create surfaces can report them
+ACTIVE_MONITOR = None
+
+def track_surface(surf):
+    if ACTIVE_MONITOR is not None and surf is not None:
+        ACTIVE_MONITOR.register(surf)
+    return surf
+
 # --- Visual Effects Classes ---
 
 class Background:
     def __init__(self):
         self.offset_y = 0
         self.offset_x = 0
-        self.grid_surf = pygame.Surface((LOGICAL_WIDTH + 40, LOGICAL_HEIGHT + 40), pygame.SRCALPHA)
+        self.grid_surf = track_surface(pygame.Surface((LOGICAL_WIDTH + 40, LOGICAL_HEIGHT + 40), pygame.SRCALPHA))
         # Pre-render grid
         for x in range(0, LOGICAL_WIDTH + 40, 40):
             pygame.draw.line(self.grid_surf, (30, 20, 40), (x, 0), (x, LOGICAL_HEIGHT + 40), 2)
@@ -109,7 +149,7 @@ class Background:
 class Particle(pygame.sprite.Sprite):
     def __init__(self, x, y, color, size, speed_range=4):
         super().__init__()
-        self.image = pygame.Surface((size, size))
+        self.image = track_surface(pygame.Surface((size, size)))
         self.image.fill(color)
         self.rect = self.image.get_rect(center=(x, y))
         angle = random.uniform(0, math.pi * 2)
@@ -137,7 +177,7 @@ class Player(pygame.sprite.Sprite):
             self.image = ASSETS['player']
         else:
             # Fallback Art
-            self.image = pygame.Surface((16, 16), pygame.SRCALPHA)
+            self.image = track_surface(pygame.Surface((16, 16), pygame.SRCALPHA))
             pygame.draw.polygon(self.image, RED, [(0, 5), (8, 16), (16, 5), (12, 0), (8, 4), (4, 0)])
             
         self.rect = self.image.get_rect(center=BOX_RECT.center)
@@ -196,7 +236,7 @@ class Boss:
             w, h = self.custom_image.get_size()
             if w > 400:
                 scale = 400 / w
-                self.custom_image = pygame.transform.scale(self.custom_image, (int(w*scale), int(h*scale)))
+                self.custom_image = track_surface(pygame.transform.scale(self.custom_image, (int(w*scale), int(h*scale))))
 
     def draw(self, surface):
         if self.shake > 0:
@@ -236,7 +276,7 @@ class Boss:
             # Eye
             eye_y = base_y + 80
             pulse = abs(math.sin(self.float_offset * 3)) * 4
-            glow_surf = pygame.Surface((100, 100), pygame.SRCALPHA)
+            glow_surf = track_surface(pygame.Surface((100, 100), pygame.SRCALPHA))
             pygame.draw.circle(glow_surf, (255, 255, 0, 50), (50, 50), 38 + pulse)
             surface.blit(glow_surf, (center_x - 50, eye_y - 50))
             pygame.draw.circle(surface, YELLOW, (center_x, eye_y), 32)
@@ -259,7 +299,7 @@ class Boss:
         pygame.draw.rect(surface, RED, (x, y, bar_w * ratio, bar_h))
         pygame.draw.rect(surface, GRAY, (x, y, bar_w, bar_h), 2)
         font = pygame.font.SysFont("Arial", 16, bold=True)
-        text = font.render("CACTUS PYRAMID", True, (200, 200, 200))
+        text = track_surface(font.render("CACTUS PYRAMID", True, (200, 200, 200)))
         surface.blit(text, (x, y + 20))
 
 # --- Projectile Classes ---
@@ -273,7 +313,7 @@ class Thorn(pygame.sprite.Sprite):
             self.image = ASSETS['thorn']
         else:
             # Fallback
-            self.image = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+            self.image = track_surface(pygame.Surface((self.w, self.h), pygame.SRCALPHA))
             pygame.draw.polygon(self.image, DARK_GREEN, [(0,0), (self.w,0), (self.w//2, self.h)])
             pygame.draw.polygon(self.image, GREEN, [(2,0), (self.w-2,0), (self.w//2, self.h-2)])
             pygame.draw.polygon(self.image, LIME, [(4,0), (self.w-4,0), (self.w//2, self.h-5)])
@@ -291,7 +331,7 @@ class Beam(pygame.sprite.Sprite):
         super().__init__()
         self.w, self.h = 40, BOX_H
         # Make a surface for the beam
-        self.image = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+        self.image = track_surface(pygame.Surface((self.w, self.h), pygame.SRCALPHA))
         self.rect = self.image.get_rect(topleft=(random.randint(BOX_RECT.left, BOX_RECT.right - 40), BOX_RECT.top))
         self.timer = 0
         self.warn_time = 50
@@ -317,7 +357,7 @@ class Beam(pygame.sprite.Sprite):
             if ASSETS.get('beam'):
                 # Custom Beam Texture
                 # Stretch the beam texture to fill the rect
-                stretched = pygame.transform.scale(ASSETS['beam'], (self.w, self.h))
+                stretched = track_surface(pygame.transform.scale(ASSETS['beam'], (self.w, self.h)))
                 self.image.blit(stretched, (0,0))
             else:
                 # Fallback Beam
@@ -337,10 +377,10 @@ class SandPuff(pygame.sprite.Sprite):
         
         if ASSETS.get('sand'):
             # Scale the custom sand particle
-            self.image = pygame.transform.scale(ASSETS['sand'], (size, size))
+            self.image = track_surface(pygame.transform.scale(ASSETS['sand'], (size, size)))
         else:
             # Fallback
-            self.image = pygame.Surface((size, size), pygame.SRCALPHA)
+            self.image = track_surface(pygame.Surface((size, size), pygame.SRCALPHA))
             c = size // 2
             pygame.draw.circle(self.image, SAND, (c, c), c)
             pygame.draw.circle(self.image, SAND_DARK, (c, c), c, 2)
@@ -376,7 +416,7 @@ class CactusWall(pygame.sprite.Sprite):
             self.image = ASSETS['wall']
         else:
             # Fallback
-            self.image = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+            self.image = track_surface(pygame.Surface((self.w, self.h), pygame.SRCALPHA))
             rect_color = GREEN
             rib_color = DARK_GREEN
             pygame.draw.rect(self.image, rect_color, (0, 0, self.w, self.h))
@@ -398,14 +438,215 @@ class CactusWall(pygame.sprite.Sprite):
         if self.rect.right < BOX_RECT.left:
             self.kill()
 
+# --- Instrumentation ---
+
+class InputLatency:
+    """Timestamps input events and histograms their delay to simulation and to display.flip.
+
+    pygame gives key events no timestamp, so each one is stamped with the midpoint between
+    the queue drain that found it and the drain before. In low-latency mode the queue is
+    drained every millisecond while the loop sleeps, which keeps stamps within about half a
+    millisecond; otherwise it is drained once a frame and the stamps are coarse estimates.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.to_sim = [0] * (len(buckets) + 1)
+        self.to_flip = [0] * (len(buckets) + 1)
+        self.queue = []     # (stamp, event) drained but not yet handled, stamp None for non-key events
+        self.pending = []   # Event times waiting for the next simulation step
+        self.simulated = [] # Event times simulated but not yet on screen
+        self.frames = deque(maxlen=16) # (flip time, slider_val) of recently shown AIM frames
+        self.last_drain = None
+        self.key_events = 0
+        self.error_ms = 0 # Summed half-width of the drain windows, i.e. how far off the stamps can be
+
+    def drain(self):
+        now = pygame.time.get_ticks()
+        start = now if self.last_drain is None else self.last_drain
+        self.last_drain = now
+        for event in pygame.event.get():
+            stamp = None
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                stamp = (start + now) / 2
+                self.key_events += 1
+                self.error_ms += (now - start) / 2
+            self.queue.append((stamp, event))
+
+    def events(self):
+        self.drain()
+        events, self.queue = self.queue, []
+        self.pending.extend(stamp for stamp, event in events if stamp is not None)
+        return events
+
+    def record(self, hist, ms):
+        hist[bisect.bisect_left(self.buckets, ms)] += 1
+
+    def mark_sim(self):
+        now = pygame.time.get_ticks()
+        for stamp in self.pending:
+            self.record(self.to_sim, now - stamp)
+        self.simulated.extend(self.pending)
+        self.pending.clear()
+
+    def mark_flip(self, slider_val=None):
+        now = pygame.time.get_ticks()
+        for stamp in self.simulated:
+            self.record(self.to_flip, now - stamp)
+        self.simulated.clear()
+        if slider_val is not None:
+            self.frames.append((now, slider_val))
+
+    def slider_at(self, stamp, fallback):
+        """Returns the slider position that was on screen when the event happened.
+
+        Between flips the screen holds the last frame, which is also the live slider_val, so
+        this only changes the result for presses that landed while the next frame was being built.
+        """
+        if not self.frames:
+            return fallback
+        val = self.frames[0][1]
+        for flip_time, slider_val in self.frames:
+            if flip_time > stamp:
+                break
+            val = slider_val
+        return val
+
+    def histograms(self):
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            'event_to_sim': dict(zip(labels, self.to_sim)),
+            'event_to_flip': dict(zip(labels, self.to_flip)),
+            'key_events': self.key_events,
+            'mean_stamp_error_ms': self.error_ms / self.key_events if self.key_events else 0,
+        }
+
+    def report(self):
+        hist = self.histograms()
+        print("--- INPUT LATENCY ---")
+        print(f"Key events: {hist['key_events']}, stamped to within +/-{hist['mean_stamp_error_ms']:.1f} ms on average")
+        print("(pygame has no event timestamps, arrival is the midpoint between queue drains)")
+        for name in ('event_to_sim', 'event_to_flip'):
+            print(f"{name}: " + ", ".join(f"{label} {count}" for label, count in hist[name].items()))
+        print("---------------------")
+
+def rss_bytes():
+    """Resident set size from /proc, falling back to peak RSS, or None where neither exists."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024 # macOS reports bytes, Linux KB
+
+def surface_bytes(surf):
+    return surf.get_pitch() * surf.get_height()
+
+class MemoryMonitor:
+    """Snapshots tracemalloc on every state change and reports growth between MAIN_MENU cycles."""
+
+    def __init__(self, verbose=True):
+        global ACTIVE_MONITOR
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.verbose = verbose
+        self.last_state = None
+        self.cycle_snapshot = None
+        self.cycles = 0 # Completed returns to MAIN_MENU, cycle 0 being the first title screen
+        self.cycle_stats = deque(maxlen=4096) # Per-cycle samples, see observe()
+        self.transitions = deque(maxlen=32) # State changes within the current cycle
+
+        # Surface pixels live outside tracemalloc, so track_surface() reports them here
+        self.live_surfaces = weakref.WeakSet()
+        self.allocated = 0
+        self.allocated_bytes = 0
+        ACTIVE_MONITOR = self
+
+    def register(self, surf):
+        self.allocated += 1
+        self.allocated_bytes += surface_bytes(surf)
+        self.live_surfaces.add(surf)
+
+    def count_sprites(self):
+        # Every live instance, not just group members, so sprites kept alive elsewhere show up
+        return dict(Counter(type(obj).__name__ for obj in gc.get_objects()
+                            if isinstance(obj, pygame.sprite.Sprite)))
+
+    def observe(self, game):
+        if game.state == self.last_state:
+            return
+        prev, self.last_state = self.last_state, game.state
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),))
+        sprites = self.count_sprites()
+        stats = {
+            'traced_bytes': sum(stat.size for stat in snapshot.statistics('filename')),
+            'rss_bytes': rss_bytes(),
+            'live_surfaces': len(self.live_surfaces),
+            'live_surface_bytes': sum(surface_bytes(surf) for surf in self.live_surfaces),
+            'sprites': sprites,
+            'live_sprites': sum(sprites.values()),
+        }
+        entry = {'from': prev, 'to': game.state}
+        entry.update(stats)
+        self.transitions.append(entry)
+
+        # Every return to the title screen closes one kiosk cycle
+        if game.state != "MAIN_MENU":
+            return
+        stats.update(allocated=self.allocated, allocated_bytes=self.allocated_bytes)
+        self.allocated = self.allocated_bytes = 0
+
+        if self.cycle_snapshot is not None:
+            self.cycles += 1
+            if self.verbose:
+                self.report(stats, snapshot)
+        self.cycle_snapshot = snapshot
+        self.cycle_stats.append(stats)
+        self.transitions.clear()
+
+    def report(self, stats, snapshot):
+        prev = self.cycle_stats[-1]
+        rss = stats['rss_bytes']
+        rss_txt = "RSS unavailable" if rss is None or prev['rss_bytes'] is None else \
+            f"RSS {format_bytes(rss)} ({format_bytes(rss - prev['rss_bytes'], signed=True)})"
+        print(f"[MEMORY] Cycle {self.cycles}: {format_bytes(stats['traced_bytes'])} traced "
+              f"({format_bytes(stats['traced_bytes'] - prev['traced_bytes'], signed=True)}), {rss_txt}")
+        print(f"    {stats['live_surfaces']} live surfaces ({format_bytes(stats['live_surface_bytes'])}), "
+              f"{stats['allocated']} allocated this cycle ({format_bytes(stats['allocated_bytes'])})")
+
+        classes = sorted(set(stats['sprites']) | set(prev['sprites']))
+        growth = {cls: stats['sprites'].get(cls, 0) - prev['sprites'].get(cls, 0) for cls in classes}
+        growth = {cls: diff for cls, diff in growth.items() if diff}
+        print(f"    live sprites {stats['sprites']}, growth {growth or 'none'}")
+
+        for entry in list(self.transitions)[:-1]:
+            print(f"    {entry['from']} -> {entry['to']}: {format_bytes(entry['traced_bytes'])} traced, "
+                  f"{entry['live_surfaces']} surfaces, sprites {entry['sprites']}")
+        top = [st for st in snapshot.compare_to(self.cycle_snapshot, 'lineno') if st.size_diff > 0]
+        for stat in top[:3]:
+            print(f"    {stat}")
+
 # --- Engine ---
 
 class Game:
-    def __init__(self):
+    def __init__(self, low_latency=LOW_LATENCY_INPUT, memory_monitor=MEMORY_MONITOR, headless=False,
+                 latency_report=False):
         pygame.init()
+        self.low_latency = low_latency
+        self.latency = InputLatency()
+        self.latency_report = latency_report
+        self.memory = MemoryMonitor() if memory_monitor else None
         
         # 1. Initialize Display FIRST
-        self.screen = pygame.display.set_mode((LOGICAL_WIDTH, LOGICAL_HEIGHT), pygame.SCALED | pygame.FULLSCREEN)
+        flags = 0 if headless else pygame.SCALED | pygame.FULLSCREEN
+        self.screen = pygame.display.set_mode((LOGICAL_WIDTH, LOGICAL_HEIGHT), flags)
         pygame.display.set_caption("Cactus Pyramid Boss Fight")
         pygame.mouse.set_visible(False)
         self.clock = pygame.time.Clock()
@@ -429,6 +670,8 @@ class Game:
         
         # State
         self.reset_game_state()
+        if self.memory:
+            self.memory.observe(self)
 
     def reset_game_state(self):
         self.state = "MAIN_MENU" # MAIN_MENU, FIGHT, PAUSE, GAME_OVER, VICTORY
@@ -463,21 +706,59 @@ class Game:
             self.particles.add(p)
 
     def draw_centered(self, text, font, y, color=WHITE):
-        s = font.render(text, True, color)
+        s = track_surface(font.render(text, True, color))
         self.screen.blit(s, (LOGICAL_WIDTH//2 - s.get_width()//2, y))
 
     def run(self):
+        if not self.low_latency:
+            while True:
+                self.frame()
+                self.clock.tick(FPS)
+
+        frame_ms = 1000 / FPS
+        work_ms = frame_ms / 2 # Running estimate of update + draw, refined every frame
+        deadline = pygame.time.get_ticks() + frame_ms
         while True:
-            self.handle_input()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            # Sleep until only the update + draw cost is left, then handle input as late as possible
+            self.sleep_until(deadline - work_ms - LATENCY_MARGIN_MS)
+            start = pygame.time.get_ticks()
+            self.frame()
+            now = pygame.time.get_ticks()
+            work_ms = 0.9 * work_ms + 0.1 * (now - start)
+            deadline += frame_ms
+            if deadline < now:
+                # Fell behind, restart the schedule instead of bursting frames to catch up
+                deadline = now + frame_ms
+
+    def sleep_until(self, target):
+        # pygame.time.wait sleeps the thread, drain in between so events get tight stamps;
+        # only the last LATENCY_SPIN_MS use the busy-waiting pygame.time.delay
+        while True:
+            left = target - pygame.time.get_ticks()
+            if left <= 0:
+                return
+            if left > LATENCY_SPIN_MS:
+                pygame.time.wait(1)
+            else:
+                pygame.time.delay(int(left))
+            self.latency.drain()
+
+    def quit(self):
+        if self.latency_report:
+            self.latency.report()
+        pygame.quit(); sys.exit()
+
+    def frame(self):
+        self.handle_input()
+        self.update()
+        self.draw()
+        if self.memory:
+            self.memory.observe(self)
 
     def handle_input(self):
-        events = pygame.event.get()
-        for event in events:
+        for stamp, event in self.latency.events():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                self.quit()
             
             if event.type == pygame.KEYDOWN:
                 # MENU
@@ -489,7 +770,7 @@ class Game:
                             self.state = "FIGHT"
                             self.sub_state = "MENU"
                         else:
-                            pygame.quit(); sys.exit()
+                            self.quit()
 
                 # PAUSE
                 elif self.state == "PAUSE":
@@ -509,6 +790,7 @@ class Game:
                             self.sub_state = "AIM"
                             self.slider_val = 0
                             self.slider_dir = 12
+                            self.latency.frames.clear()
                             self.dialogue = "Strike perfectly!"
                             self.update_dialogue_lines()
 
@@ -516,7 +798,12 @@ class Game:
                         if event.key == pygame.K_z:
                             # Attack Logic
                             center = LOGICAL_WIDTH // 2
-                            hit_x = (LOGICAL_WIDTH//2 - 250) + self.slider_val
+                            if self.low_latency:
+                                # Judge the strike against what was on screen at the key press
+                                slider = self.latency.slider_at(stamp, self.slider_val)
+                            else:
+                                slider = self.slider_val
+                            hit_x = (LOGICAL_WIDTH//2 - 250) + slider
                             dist = abs(center - hit_x)
                             
                             dmg = 0
@@ -553,6 +840,7 @@ class Game:
                         self.reset_game_state()
 
     def update(self):
+        self.latency.mark_sim()
         self.bg.draw(self.screen)
         self.particles.update()
 
@@ -626,7 +914,7 @@ class Game:
                 btn_rect = pygame.Rect(BOX_RECT.left + 20, BOX_RECT.top + 20, 140, 40)
                 color = ORANGE if (pygame.time.get_ticks()//500)%2==0 else RED
                 pygame.draw.rect(self.screen, color, btn_rect, 2)
-                txt = self.font_ui.render("FIGHT [Z]", True, color)
+                txt = track_surface(self.font_ui.render("FIGHT [Z]", True, color))
                 txt_rect = txt.get_rect(center=btn_rect.center)
                 self.screen.blit(txt, txt_rect)
                 
@@ -641,23 +929,23 @@ class Game:
             if self.state not in ["GAME_OVER", "VICTORY"]:
                 text_y = BOX_RECT.top + 80 if self.sub_state == "MENU" else BOX_RECT.top + 20
                 for i, line in enumerate(self.dialogue_lines):
-                    s = self.font_dialogue.render("* " + line if i == 0 else "  " + line, True, WHITE)
+                    s = track_surface(self.font_dialogue.render("* " + line if i == 0 else "  " + line, True, WHITE))
                     self.screen.blit(s, (BOX_RECT.left + 20, text_y + (i * 25)))
 
             if self.display_dmg_timer > 0:
                 y_off = (60 - self.display_dmg_timer)
-                s = self.font_dmg.render(self.display_dmg, True, RED)
+                s = track_surface(self.font_dmg.render(self.display_dmg, True, RED))
                 self.screen.blit(s, (LOGICAL_WIDTH//2 - s.get_width()//2, BOX_RECT.top - 120 - y_off))
 
             pygame.draw.rect(self.screen, RED, (BOX_RECT.left + 50, BOX_RECT.bottom + 15, self.player.max_hp * 6, 20))
             pygame.draw.rect(self.screen, YELLOW, (BOX_RECT.left + 50, BOX_RECT.bottom + 15, self.player.hp * 6, 20))
-            hp_txt = self.font_small.render(f"HP {self.player.hp} / {self.player.max_hp}", True, WHITE)
+            hp_txt = track_surface(self.font_small.render(f"HP {self.player.hp} / {self.player.max_hp}", True, WHITE))
             self.screen.blit(hp_txt, (BOX_RECT.left + 50 + (self.player.max_hp*6) + 15, BOX_RECT.bottom + 15))
-            lbl = self.font_small.render("LV 1", True, WHITE)
+            lbl = track_surface(self.font_small.render("LV 1", True, WHITE))
             self.screen.blit(lbl, (BOX_RECT.left, BOX_RECT.bottom + 15))
 
             if self.state == "PAUSE":
-                overlay = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT), pygame.SRCALPHA)
+                overlay = track_surface(pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT), pygame.SRCALPHA))
                 overlay.fill((0,0,0,180))
                 self.screen.blit(overlay, (0,0))
                 self.draw_centered("- PAUSED -", self.font_big, 150)
@@ -675,6 +963,88 @@ class Game:
                 self.draw_centered("The desert falls silent. Press Z", self.font_ui, 300, WHITE)
 
         pygame.display.flip()
+        aiming = self.state == "FIGHT" and self.sub_state == "AIM"
+        self.latency.mark_flip(self.slider_val if aiming else None)
+
+# --- Soak Test ---
+
+def autoplay(game):
+    """Presses Z whenever a human would, striking when the slider nears the centre."""
+    press = False
+    if game.state in ["MAIN_MENU", "VICTORY", "GAME_OVER"]:
+        press = True
+    elif game.state == "FIGHT":
+        if game.sub_state == "MENU":
+            press = True
+        elif game.sub_state == "AIM":
+            press = abs(game.slider_val - 250) < 12
+    if press:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_z))
+
+def growth_per_cycle(samples):
+    """Least-squares slope of a per-cycle series, in bytes per cycle."""
+    n = len(samples)
+    mean_x = (n - 1) / 2
+    mean_y = sum(samples) / n
+    spread = sum((i - mean_x) ** 2 for i in range(n))
+    return sum((i - mean_x) * (y - mean_y) for i, y in enumerate(samples)) / spread if spread else 0
+
+def soak_test(cycles, warmup=SOAK_WARMUP_CYCLES):
+    """Plays full fights headlessly and returns False if memory per cycle does not stay flat."""
+    if cycles < warmup + 2:
+        raise ValueError(f"soak needs at least {warmup + 2} cycles to fit growth after {warmup} warm-up cycles")
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    game = Game(memory_monitor=True, headless=True)
+    game.memory.verbose = False
+
+    # The monitor's history is bounded, so keep every cycle's sample here
+    samples = [game.memory.cycle_stats[-1]]
+    while game.memory.cycles < cycles:
+        done = game.memory.cycles
+        autoplay(game)
+        game.frame()
+        if game.memory.cycles > done:
+            samples.append(game.memory.cycle_stats[-1])
+            if game.memory.cycles % 100 == 0:
+                print(f"[SOAK] {game.memory.cycles} / {cycles} cycles")
+    pygame.quit()
+
+    samples = samples[warmup:]
+    checks = [
+        ('traced', 'traced_bytes', SOAK_MAX_GROWTH_PER_CYCLE, format_bytes),
+        ('RSS', 'rss_bytes', SOAK_MAX_RSS_GROWTH_PER_CYCLE, format_bytes),
+        ('live surfaces', 'live_surface_bytes', SOAK_MAX_SURFACE_GROWTH_PER_CYCLE, format_bytes),
+        ('live sprites', 'live_sprites', SOAK_MAX_SPRITE_GROWTH_PER_CYCLE, format_count),
+    ]
+    ok = True
+    for label, key, limit, fmt in checks:
+        series = [s[key] for s in samples]
+        if None in series:
+            print(f"[SOAK] {label}: unavailable on this platform, not checked")
+            continue
+        slope = growth_per_cycle(series)
+        print(f"[SOAK] {label}: {fmt(slope, signed=True)} per cycle (limit {fmt(limit)})")
+        ok = ok and slope <= limit
+    print("[SOAK] PASS" if ok else "[SOAK] FAIL: memory grows between cycles")
+    return ok
 
 if __name__ == "__main__":
-    Game().run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Cactus Pyramid Boss Fight")
+    parser.add_argument('--low-latency', action='store_true', default=LOW_LATENCY_INPUT,
+                        help="poll input just before the frame deadline and judge strikes at key-press time")
+    parser.add_argument('--latency-report', action='store_true',
+                        help="print input latency histograms on quit")
+    parser.add_argument('--memory-monitor', action='store_true', default=MEMORY_MONITOR,
+                        help="snapshot memory on state changes and report growth every cycle")
+    parser.add_argument('--soak', type=int, metavar='CYCLES',
+                        help="auto-play CYCLES fights headlessly and fail if memory per cycle grows")
+    args = parser.parse_args()
+    if args.soak is not None:
+        try:
+            passed = soak_test(args.soak)
+        except ValueError as e:
+            parser.error(str(e))
+        sys.exit(0 if passed else 1)
+    Game(low_latency=args.low_latency, memory_monitor=args.memory_monitor,
+         latency_report=args.latency_report).run()
\ No newline at end of file